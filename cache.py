@@ -0,0 +1,134 @@
+import os
+import pickle
+from collections import OrderedDict
+import numpy as np
+
+def state_key(state):
+    """ canonical hashable key for a game state (states may hold floats or ints) """
+    return tuple(int(x) for x in state)
+
+class EvaluationCache:
+    """
+    Bounded LRU cache of rollout statistics, shared across moves and games:
+    - keyed by state_key(state), each entry maps action -> [payout sum, payout sum of squares, count]
+    - payouts are whatever the agent's get_return produces: for MonteCarloRolloutAgent
+    they are from the perspective of the player to move, so both players can share a cache
+    - n.b. heuristic rollout payouts depend on the heuristic and K (and follow the
+    heuristic's own orientation), so agents with different heuristics must not share a cache
+    - search() adds batches of rollouts to a position until it is settled: either the best
+    action leads every other by z standard errors, or (for near-tied actions, where that
+    may never happen) every action has max_samples cached rollouts; settled positions cost no rollouts
+    - if path is given, the cache is loaded from it (if it exists) and save() writes it back
+    """
+    def __init__(self, maxsize=100000, path=None):
+        self.maxsize = maxsize
+        self.path = path
+        self.entries = OrderedDict()
+        if path is not None and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, state):
+        return state_key(state) in self.entries
+
+    def get(self, state):
+        """ returns {action: [sum, sumsq, count]} for state, or None if not cached """
+        key = state_key(state)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        return entry
+
+    def update(self, state, action, payouts):
+        """ adds new rollout payouts for taking action in state """
+        key = state_key(state)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+        if len(payouts) == 0:
+            return
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = {}
+            self.entries[key] = entry
+        stats = entry.setdefault(int(action), [0., 0., 0])
+        payouts = np.asarray(payouts, dtype=float)
+        stats[0] += payouts.sum()
+        stats[1] += (payouts**2).sum()
+        stats[2] += len(payouts)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def get_means(self, state, actions):
+        """ returns mean payout of each action (nan if never sampled) """
+        entry = self.get(state) or {}
+        means = []
+        for a in actions:
+            s, _, n = entry.get(a, (0., 0., 0))
+            means.append(s/n if n > 0 else np.nan)
+        return np.array(means)
+
+    def is_settled(self, state, actions, min_samples=100, z=3., max_samples=None):
+        """
+        returns True if every action has at least max_samples cached samples,
+        or if the best action's mean payout exceeds every other action's
+        by more than z standard errors of the difference,
+        with at least min_samples cached samples per action
+        (actions whose payouts have all been identical count as settled)
+        """
+        entry = self.get(state)
+        if entry is None or any(a not in entry for a in actions):
+            return False
+        if len(actions) == 1:
+            return True
+        stats = np.array([entry[a] for a in actions], dtype=float)
+        sums, sumsqs, counts = stats[:,0], stats[:,1], stats[:,2]
+        if max_samples is not None and counts.min() >= max_samples:
+            return True
+        if counts.min() < max(min_samples, 2):
+            return False
+        means = sums / counts
+        variances = np.maximum(sumsqs / counts - means**2, 0) * counts / (counts - 1)
+        sems_sq = variances / counts
+        best = np.argmax(means)
+        others = np.arange(len(actions)) != best
+        gaps = means[best] - means[others]
+        ses = np.sqrt(sems_sq[best] + sems_sq[others])
+        return bool(np.all((gaps > z * ses) | (ses == 0)))
+
+    def search(self, state, actions, rollout, get_return, nsamples, min_samples=100, z=3., max_samples=None):
+        """
+        adds batches of min_samples rollouts per action until state is settled,
+        spending at most nsamples rollouts per action on this visit;
+        returns the best action and the mean cached payout of each action
+        """
+        nspent = 0
+        while nspent < nsamples and not self.is_settled(state, actions, min_samples, z, max_samples):
+            nbatch = min(max(min_samples, 1), nsamples - nspent)
+            for action in actions:
+                payouts = []
+                for _ in range(nbatch):
+                    data = rollout(state, action)
+                    payouts.append(get_return(data, state[-1]))
+                self.update(state, action, payouts)
+            nspent += nbatch
+        mean_payouts = self.get_means(state, actions)
+        return actions[np.argmax(mean_payouts)], mean_payouts
+
+    def load(self, path=None):
+        path = self.path if path is None else path
+        with open(path, 'rb') as f:
+            entries = pickle.load(f)
+        self.entries = OrderedDict(entries)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def save(self, path=None):
+        path = self.path if path is None else path
+        assert path is not None, 'no path given to save cache to'
+        # write to a temporary file first so an interrupted save can't truncate the cache
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self.entries, f)
+        os.replace(tmp_path, path)
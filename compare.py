@@ -1,11 +1,18 @@
 from play import play
+from cache import EvaluationCache
 
-def sim(player_types, nreps=20, nsamples=[1000,3000]):
+def sim(player_types, nreps=20, nsamples=(1000,3000), use_cache=False):
+	# optionally reuse rollout statistics across all games, since openings repeat;
+	# one cache per nsamples so that neither player benefits from the other's rollouts
+	# n.b. with a cache, agents may use more or fewer than nsamples rollouts per position
+	if not hasattr(nsamples, '__iter__'):
+		nsamples = [nsamples]*len(player_types)
+	cache = [EvaluationCache() for _ in nsamples] if use_cache else None
 	outcomes = []
-	print('Players: {}, nreps={}, nsamples={}'.format(player_types, nreps, nsamples))
+	print('Players: {}, nreps={}, nsamples={}, use_cache={}'.format(player_types, nreps, nsamples, use_cache))
 	for i in range(nreps):
-		outcome1 = play(player_types, nsamples, verbose=False, render_mode=None)
-		outcome2 = play(player_types[::-1], nsamples, verbose=False, render_mode=None)
+		outcome1 = play(player_types, nsamples, verbose=False, render_mode=None, cache=cache)
+		outcome2 = play(player_types[::-1], nsamples, verbose=False, render_mode=None, cache=cache)
 		print('{}th outcome: {}, {}'.format(i, outcome1, outcome2))
 		outcomes.append((outcome1, outcome2))
 	print(outcomes)
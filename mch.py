@@ -22,14 +22,20 @@ class MonteCarloHeuristicRolloutAgent:
     and then chooses the action that led to the best average return
     - but here, each rollout is only of the next K time steps (not the full episode), and the average return is estimated as a heuristic
     - the heuristic is a function f(s,s'), where s is the current state of the game, and s' is the state of the game after the simulated rollout
+    - an optional EvaluationCache reuses rollout statistics across moves and games (see MonteCarloRolloutAgent);
+    since payouts depend on K and the heuristic, the cache must not be shared with agents using different ones
     """
-    def __init__(self, name=None, K=4, heuristic=None, nsamples=1000, verbose=False):
+    def __init__(self, name=None, K=4, heuristic=None, nsamples=1000, verbose=False, cache=None, min_samples=100, z=3., max_samples=None):
         self.name = name
         self.K = K
         if heuristic is None:
             heuristic = lambda s,snext: linear_heuristic(s, snext, initial_heuristic())
         self.heuristic = heuristic
         self.nsamples = nsamples
+        self.cache = cache
+        self.min_samples = min_samples
+        self.z = z
+        self.max_samples = nsamples if max_samples is None else max_samples
         self.verbose = verbose
         self.estimated_win_percents = []
 
@@ -61,6 +67,9 @@ class MonteCarloHeuristicRolloutAgent:
 
     def find_best_action(self, state):
         actions = Mancala.get_valid_actions(state)
+        if self.cache is not None:
+            return self.cache.search(state, actions, self.rollout, self.get_return,
+                self.nsamples, self.min_samples, self.z, self.max_samples)
         mean_payouts = []
         for action in actions:
             payouts = []
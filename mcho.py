@@ -3,6 +3,7 @@ from cmaes import CMA
 from mancala import Mancala
 from play import play_game
 from mch import linear_heuristic, MonteCarloHeuristicRolloutAgent
+from cache import EvaluationCache
 
 def get_players(heuristics, K, nsamples):
     players = []
@@ -37,7 +38,8 @@ def learn(nsteps=50, K=2, nsamples=500, verbose=True):
         for i in range(optimizer.population_size):
             h = optimizer.ask()
             hfcn = lambda s, snext: linear_heuristic(s, snext, h)
-            player = MonteCarloHeuristicRolloutAgent(name='P{}'.format(i+1), K=K, nsamples=nsamples, heuristic=hfcn)
+            # each heuristic gets its own cache, reused across its round robin games
+            player = MonteCarloHeuristicRolloutAgent(name='P{}'.format(i+1), K=K, nsamples=nsamples, heuristic=hfcn, cache=EvaluationCache())
             players.append(player)
             hs.append(h)
         scores = round_robin(players, verbose=verbose)
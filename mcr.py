@@ -6,10 +6,19 @@ class MonteCarloRolloutAgent:
     Pure Monte Carlo Rollouts:
     - given a state, performs N rollouts starting from each available action
     and then chooses the action that led to the best average return
+    - if given an EvaluationCache, rollout statistics are reused across moves and games:
+    each visit adds batches of min_samples rollouts per action (at most nsamples in total)
+    until the best action leads by z standard errors, or, for near-tied actions,
+    until every action has max_samples (default nsamples) cached rollouts;
+    either way, a position visited often enough costs no rollouts at all
     """
-    def __init__(self, name=None, nsamples=1000, verbose=False):
+    def __init__(self, name=None, nsamples=1000, verbose=False, cache=None, min_samples=100, z=3., max_samples=None):
         self.name = name
         self.nsamples = nsamples
+        self.cache = cache
+        self.min_samples = min_samples
+        self.z = z
+        self.max_samples = nsamples if max_samples is None else max_samples
         self.verbose = verbose
         self.estimated_win_percents = []
 
@@ -38,6 +47,9 @@ class MonteCarloRolloutAgent:
 
     def find_best_action(self, state):
         actions = Mancala.get_valid_actions(state)
+        if self.cache is not None:
+            return self.cache.search(state, actions, self.rollout, self.get_return,
+                self.nsamples, self.min_samples, self.z, self.max_samples)
         mean_payouts = []
         for action in actions:
             payouts = []
@@ -4,6 +4,7 @@ from mancala import Mancala
 from mcr import MonteCarloRolloutAgent
 from mmcts import MCTSMancalaAgent
 from mch import MonteCarloHeuristicRolloutAgent
+from cache import EvaluationCache
 
 class HumanAgent:
     def get_action(self, state, index=None):
@@ -13,15 +14,17 @@ class HumanAgent:
             action = input("player {}'s next move? ({}): ".format(int(state[-1]), ''.join(actions))).upper()
         return Mancala.letter_to_bin(action)
 
-def get_players(player_types, verbose, nsamples):
+def get_players(player_types, verbose, nsamples, cache=None):
     players = []
     if not hasattr(nsamples, '__iter__'):
         nsamples = [nsamples]*len(player_types)
+    if not isinstance(cache, (list, tuple)):
+        cache = [cache]*len(player_types)
     for i, player_type in enumerate(player_types):
         if player_type == 'human':
             player = HumanAgent()
         elif player_type == 'mcr':
-            player = MonteCarloRolloutAgent(name='P{}'.format(i+1), nsamples=nsamples[i], verbose=verbose)
+            player = MonteCarloRolloutAgent(name='P{}'.format(i+1), nsamples=nsamples[i], verbose=verbose, cache=cache[i])
         elif player_type == 'mcts':
             # n.b. exploitationWeight==0 is essentially a rollout algorithm
             # because we only select nodes based on avg return
@@ -58,9 +61,14 @@ def play_game(players, render_mode=None):
                 player.update(action)
     return Mancala.get_winner(env.state)
 
-def play(player_types, nsamples, plotfile=None, verbose=True, render_mode='human'):
-    players = get_players(player_types, verbose=verbose, nsamples=nsamples)
+def play(player_types, nsamples, plotfile=None, verbose=True, render_mode='human', cache=None):
+    # n.b. mcr payouts are from the perspective of the player to move,
+    # so players with the same nsamples can share a cache
+    players = get_players(player_types, verbose=verbose, nsamples=nsamples, cache=cache)
     outcome = play_game(players, render_mode)
+    caches = cache if isinstance(cache, (list, tuple)) else [cache]
+    for c in set(c for c in caches if c is not None and c.path is not None):
+        c.save()
 
     if plotfile:
         plot(players, plotfile)
@@ -73,5 +81,8 @@ if __name__ == "__main__":
     parser.add_argument('player2', choices=['human', 'mcr', 'mcts'])
     parser.add_argument('--nsamples', type=int, default=3000)
     parser.add_argument('--plotfile', type=str)
+    parser.add_argument('--cachefile', type=str, help='file for persisting mcr rollout statistics between runs (ignored unless a player is mcr)')
     args = parser.parse_args()
-    play([args.player1, args.player2], nsamples=args.nsamples, plotfile=args.plotfile)
+    use_cache = args.cachefile and 'mcr' in [args.player1, args.player2]
+    cache = EvaluationCache(path=args.cachefile) if use_cache else None
+    play([args.player1, args.player2], nsamples=args.nsamples, plotfile=args.plotfile, cache=cache)